@@ -1,8 +1,131 @@
-from functools import wraps
-from typing import Any, Callable, Dict
+import atexit
+import inspect
+import queue
+import threading
+import traceback
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Optional
 
+import numpy as np
 import pandas as pd
-from tabulate import tabulate
+
+# Bound once to skip the attribute lookup on every wrapped call
+_DataFrame = pd.DataFrame
+
+# Changed rows printed per column, longer diffs keep only the head and tail
+_MAX_PRINTED_ROWS = 20
+
+# Reports of decorators used with background=True, printed by a worker thread
+_REPORT_QUEUE: queue.Queue = queue.Queue()
+_report_thread: Optional[threading.Thread] = None
+_report_thread_lock = threading.Lock()
+
+
+@lru_cache(maxsize=128)
+def _numpy_dtype_str(dtype: np.dtype) -> str:
+    """Return str(dtype), cached since many columns usually share a dtype."""
+    return str(dtype)
+
+
+def _dtype_str(dtype: Any) -> str:
+    """Return str(dtype), going through the cache only for numpy dtypes."""
+    # Extension dtypes are not cached: hashing a CategoricalDtype hashes all
+    # of its categories, and the cache would keep them alive
+    if isinstance(dtype, np.dtype):
+        return _numpy_dtype_str(dtype)
+    return str(dtype)
+
+
+def _same_buffer(before: np.ndarray, after: np.ndarray) -> bool:
+    """Check if two arrays are views with the same layout on the same data."""
+    return (
+        before.__array_interface__["data"][0] == after.__array_interface__["data"][0]
+        and before.strides == after.strides
+    )
+
+
+def _columns_equal(before: pd.Series, after: pd.Series) -> bool:
+    """Check if two aligned columns with the same dtype hold the same values."""
+    dtype = before.dtype
+    if isinstance(dtype, pd.ArrowDtype):
+        # Arrow backed columns can only exist if pyarrow is installed,
+        # compare the Arrow buffers directly instead of going through
+        # Series.equals
+        import pyarrow as pa
+
+        return pa.array(before.array).equals(pa.array(after.array))
+    if not isinstance(dtype, np.dtype):
+        return before.equals(after)
+
+    before_values = before.to_numpy(copy=False)
+    after_values = after.to_numpy(copy=False)
+
+    # Both columns are views on the same buffer, nothing to read
+    if _same_buffer(before_values, after_values):
+        return True
+
+    # Integer and bool columns cannot hold NaN, so the raw ndarrays are
+    # compared directly. Series.equals is faster for the other kinds than
+    # np.array_equal(equal_nan=True), which builds isnan temporaries.
+    if dtype.kind in "biu":
+        return np.array_equal(before_values, after_values)
+    return before.equals(after)
+
+
+def _homogeneous_column_changes(
+    df_before: pd.DataFrame, df_after: pd.DataFrame
+) -> Optional[np.ndarray]:
+    """Return which columns changed if both frames are one numeric block.
+
+    Both frames must have the same rows and columns in the same order.
+    Returns None when the frames need a per-column check instead.
+    """
+    # Frames split over several blocks would be consolidated into a full
+    # copy by to_numpy, the per-column check is cheaper for those
+    if df_before._mgr.nblocks != 1 or df_after._mgr.nblocks != 1:
+        return None
+
+    dtypes = set(df_before.dtypes) | set(df_after.dtypes)
+    if len(dtypes) != 1:
+        return None
+    dtype = dtypes.pop()
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "biuf":
+        return None
+
+    # to_numpy returns a view of the block, so the whole frame is compared
+    # in one vectorized pass without copying it
+    before_values = df_before.to_numpy(copy=False)
+    after_values = df_after.to_numpy(copy=False)
+    if _same_buffer(before_values, after_values):
+        return np.zeros(before_values.shape[1], dtype=bool)
+
+    diff = before_values != after_values
+    if dtype.kind == "f":
+        diff &= ~(np.isnan(before_values) & np.isnan(after_values))
+    return diff.any(axis=0)
+
+
+def _shares_data(df_before: pd.DataFrame, df_after: pd.DataFrame) -> bool:
+    """Check if both frames have the same labels and the very same blocks."""
+    if df_before is df_after:
+        return True
+
+    # pandas has no public API for this, the block manager is compared
+    # directly. Only pointers are compared, no values are read.
+    before_blocks = df_before._mgr.blocks
+    after_blocks = df_after._mgr.blocks
+    if len(before_blocks) != len(after_blocks) or not all(
+        before_blk.values is after_blk.values
+        and np.array_equal(before_blk.mgr_locs.as_array, after_blk.mgr_locs.as_array)
+        for before_blk, after_blk in zip(before_blocks, after_blocks)
+    ):
+        return False
+
+    # Frames sharing their blocks usually share their axes too, where
+    # Index.equals returns on its identity check
+    return df_before.columns.equals(df_after.columns) and df_before.index.equals(
+        df_after.index
+    )
 
 
 class DataFrameChangeTracker:
@@ -11,6 +134,24 @@ class DataFrameChangeTracker:
     @staticmethod
     def compare_df(df_before: pd.DataFrame, df_after: pd.DataFrame) -> Dict[str, Any]:
         """Compare two dataframes and return a dictionary of changes."""
+        if _shares_data(df_before, df_after):
+            return {
+                "rows": {
+                    "before": len(df_before),
+                    "after": len(df_after),
+                    "difference": 0,
+                },
+                "columns": {"added": [], "removed": [], "modified": []},
+                "schema_changes": {},
+                "content_changes": [],
+            }
+
+        # Index set operations run in C on the column hashtables pandas
+        # already keeps, so there is no need to build Python sets here
+        before_cols = df_before.columns
+        after_cols = df_after.columns
+        common_cols = before_cols.intersection(after_cols)
+
         changes: dict = {
             "rows": {
                 "before": len(df_before),
@@ -18,8 +159,8 @@ class DataFrameChangeTracker:
                 "difference": len(df_after) - len(df_before),
             },
             "columns": {
-                "added": list(set(df_after.columns) - set(df_before.columns)),
-                "removed": list(set(df_before.columns) - set(df_after.columns)),
+                "added": after_cols.difference(before_cols, sort=False).tolist(),
+                "removed": before_cols.difference(after_cols, sort=False).tolist(),
                 "modified": [],
             },
             "schema_changes": {},
@@ -27,27 +168,43 @@ class DataFrameChangeTracker:
         }
 
         # Check for schema changes in before-after df
-        # This line makes two sets of column names for both dataframes,
-        # then the & operator makes it that common_cols will only have
-        # values contained in both
-
-        common_cols = set(df_before.columns) & set(df_after.columns)
-        for col in common_cols:
-            # iterate through all the columns datatypes
-            # the IF statement is active if the dtypes are different
-            # this to detect any corruption during change
-            before_dtype = df_before[col].dtype
-            after_dtype = df_after[col].dtype
-
-            if before_dtype != after_dtype:
+        # df.dtypes is pulled once per frame and compared in a single
+        # vectorized pass instead of looking up each column's dtype
+        before_dtypes = df_before.dtypes.reindex(common_cols)
+        after_dtypes = df_after.dtypes.reindex(common_cols)
+        dtype_mismatch = before_dtypes.values != after_dtypes.values
+
+        # Columns can only be equal when both frames share the same rows
+        same_rows = len(df_before) == len(df_after) and df_before.index.equals(
+            df_after.index
+        )
+
+        column_changed: Dict[Any, bool] = {}
+        if same_rows and before_cols.equals(after_cols):
+            homogeneous_changes = _homogeneous_column_changes(df_before, df_after)
+            if homogeneous_changes is not None:
+                column_changed = dict(zip(before_cols, homogeneous_changes))
+
+        for col, dtype_changed in zip(common_cols, dtype_mismatch):
+            # A dtype change already means the column changed, so its values
+            # are not read at all
+            if dtype_changed:
                 changes["schema_changes"][col] = {
-                    "before": str(before_dtype),
-                    "after": str(after_dtype),
+                    "before": _dtype_str(before_dtypes[col]),
+                    "after": _dtype_str(after_dtypes[col]),
                 }
+                changes["content_changes"].add(col)
+                changes["columns"]["modified"].append(col)
+                continue
 
             # Check if content changed in the columns
-            # if the columns are different in any iteration it appends them
-            if not df_before[col].equals(df_after[col]):
+            if col in column_changed:
+                changed = column_changed[col]
+            else:
+                changed = not same_rows or not _columns_equal(
+                    df_before[col], df_after[col]
+                )
+            if changed:
                 changes["content_changes"].add(col)
                 changes["columns"]["modified"].append(col)
 
@@ -55,8 +212,293 @@ class DataFrameChangeTracker:
         return changes
 
 
-def track_dataframe_changes(func: Callable) -> Callable:
-    """Decorator to track changes to DataFrames."""
+def _format_comparison(comparison: pd.DataFrame, tablefmt: Optional[str]) -> str:
+    """Render a comparison table, truncated to its first and last rows."""
+    n = len(comparison)
+    if n > _MAX_PRINTED_ROWS:
+        half = _MAX_PRINTED_ROWS // 2
+        marker = pd.DataFrame({col: ["..."] for col in comparison.columns})
+        marker.iloc[0, 0] = f"... {n - _MAX_PRINTED_ROWS} more ..."
+        comparison = pd.concat(
+            [comparison.head(half), marker, comparison.tail(half)],
+            ignore_index=True,
+        )
+
+    if tablefmt is None:
+        return comparison.to_string(index=False)
+
+    # tabulate is only needed when a specific table format is requested
+    from tabulate import tabulate
+
+    return tabulate(comparison, headers="keys", tablefmt=tablefmt, showindex=False)
+
+
+def _same_numpy_dtype(before_dtype: Any, after_dtype: Any) -> bool:
+    """Check if a column keeps one numpy dtype that numpy can compare."""
+    return (
+        isinstance(before_dtype, np.dtype)
+        and before_dtype.kind in "biufcmM"
+        and before_dtype == after_dtype
+    )
+
+
+def _unique_row_keys(index: pd.Index) -> pd.MultiIndex:
+    """Pair each row label with its occurrence number to make it unique."""
+    occurrence = (
+        pd.Series(0, index=index)
+        .groupby(level=list(range(index.nlevels)), sort=False, dropna=False)
+        .cumcount()
+    )
+    levels = [index.get_level_values(i) for i in range(index.nlevels)]
+    return pd.MultiIndex.from_arrays(levels + [occurrence.to_numpy()])
+
+
+def _print_content_changes(
+    df_before: pd.DataFrame,
+    df_after: pd.DataFrame,
+    content_changes: list,
+    tablefmt: Optional[str] = None,
+) -> None:
+    """Print the before and after values of the changed rows of each column."""
+    if not content_changes:
+        return
+
+    # Add index labels for context
+    context_cols = ["name"] if "name" in df_before.columns else []
+
+    # Align both dataframes on their common rows once, instead of running
+    # .loc on each of them for every column. Repeated labels are paired by
+    # occurrence, the nth row labelled x before with the nth one after.
+    before_keys = df_before.index
+    after_keys = df_after.index
+    if not after_keys.is_unique:
+        before_keys = _unique_row_keys(before_keys)
+        after_keys = _unique_row_keys(after_keys)
+
+    # One lookup in the hashtable pandas caches on the index gives the
+    # positions of the common rows in both frames, in df_before order
+    after_positions = after_keys.get_indexer(before_keys)
+    in_after = after_positions >= 0
+
+    # Only the changed and context columns are copied out of the frames
+    before_cols = list(dict.fromkeys(content_changes + context_cols))
+    before_common = df_before.iloc[
+        np.flatnonzero(in_after), df_before.columns.get_indexer(before_cols)
+    ]
+    after_common = df_after.iloc[
+        after_positions[in_after], df_after.columns.get_indexer(content_changes)
+    ]
+
+    # Context values are taken once and sliced by position for every
+    # changed column
+    context_values = {
+        context_col: before_common[context_col].to_numpy(copy=False)
+        for context_col in context_cols
+    }
+
+    # Columns with the same numpy dtype before and after are compared
+    # together in one 2-D comparison. Comparing the whole frame at once
+    # would upcast mixed dtypes into a single object array.
+    before_dtypes = before_common.dtypes
+    after_dtypes = after_common.dtypes
+    dtype_groups: Dict[np.dtype, list] = {}
+    other_cols = []
+    for col in content_changes:
+        if _same_numpy_dtype(before_dtypes[col], after_dtypes[col]):
+            dtype_groups.setdefault(before_dtypes[col], []).append(col)
+        else:
+            other_cols.append(col)
+
+    changed_rows: Dict[Any, tuple] = {}
+    for dtype, cols in dtype_groups.items():
+        before_values = before_common[cols].to_numpy()
+        after_values = after_common[cols].to_numpy()
+
+        # Compare only the common rows, missing values on both sides are not
+        # a change, same as in DataFrame.compare and compare_df
+        diff = before_values != after_values
+        if dtype.kind not in "biu":
+            diff &= ~(pd.isna(before_values) & pd.isna(after_values))
+        for j in np.flatnonzero(diff.any(axis=0)):
+            changed_idx = np.flatnonzero(diff[:, j])
+            changed_rows[cols[j]] = (
+                changed_idx,
+                before_values[changed_idx, j],
+                after_values[changed_idx, j],
+            )
+
+    # Extension, object and changed dtypes are compared by pandas on object
+    # values: unlike numpy it does not fail on pd.NA, and values keep their
+    # type (Int64 stays int, datetimes become Timestamps). pandas reports
+    # NA != NA as changed, so rows missing on both sides are masked out.
+    for col in other_cols:
+        before_values = before_common[col].to_numpy(dtype=object)
+        after_values = after_common[col].to_numpy(dtype=object)
+        before_series = pd.Series(before_values, dtype=object)
+        changed_mask = (before_series != after_values).to_numpy()
+        changed_mask &= ~(pd.isna(before_values) & pd.isna(after_values))
+        if changed_mask.any():
+            changed_idx = np.flatnonzero(changed_mask)
+            changed_rows[col] = (
+                changed_idx,
+                before_values[changed_idx],
+                after_values[changed_idx],
+            )
+
+    for col in content_changes:
+        if col in changed_rows:
+            changed_idx, before_changed, after_changed = changed_rows[col]
+            print(f"\nChanges in {col}:")
+            comparison = pd.DataFrame(
+                {
+                    "Before": before_changed,
+                    "After": after_changed,
+                }
+            )
+            for context_col, values in context_values.items():
+                comparison[context_col] = values[changed_idx]
+
+            print(_format_comparison(comparison, tablefmt))
+
+
+def _print_changes(
+    func_name: str,
+    df_before: pd.DataFrame,
+    df_after: pd.DataFrame,
+    changes: Dict[str, Any],
+    tablefmt: Optional[str] = None,
+) -> None:
+    """Print the changes a function made to a DataFrame."""
+    print(f"\nFunction: {func_name}")
+
+    if changes["rows"]["difference"] != 0:
+        print(
+            f"Rows: {changes['rows']['before']} → {changes['rows']['after']} ({changes['rows']['difference']:+d})"
+        )
+    else:
+        print("No row changes detected")
+
+    if changes["content_changes"]:
+        print(f"Content changes in columns: {changes['content_changes']}")
+
+    _print_content_changes(df_before, df_after, changes["content_changes"], tablefmt)
+
+
+def _report_worker() -> None:
+    """Print queued reports until the interpreter exits."""
+    while True:
+        report = _REPORT_QUEUE.get()
+        try:
+            _print_changes(*report)
+        except Exception:
+            # Keep the worker alive so later reports are still printed
+            traceback.print_exc()
+        finally:
+            _REPORT_QUEUE.task_done()
+
+
+def _queue_report(*report: Any) -> None:
+    """Queue a report for the worker thread, starting it on first use."""
+    global _report_thread
+
+    with _report_thread_lock:
+        if _report_thread is None:
+            _report_thread = threading.Thread(
+                target=_report_worker, name="df-checker-reports", daemon=True
+            )
+            _report_thread.start()
+    _REPORT_QUEUE.put(report)
+
+
+def flush_reports() -> None:
+    """Block until all reports queued with background=True are printed."""
+    if _report_thread is not None:
+        _REPORT_QUEUE.join()
+
+
+# The worker is a daemon thread, print what is left before exiting
+atexit.register(flush_reports)
+
+
+def _snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    """Take a copy of df that is not affected by later in-place changes."""
+    # With copy-on-write enabled a shallow copy shares the blocks and pandas
+    # splits them on the first write, so the data is never copied upfront.
+    # Without it a shallow copy would see in-place changes, so deep copy.
+    try:
+        copy_on_write = pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        copy_on_write = False
+    return df.copy(deep=not copy_on_write)
+
+
+def _find_dataframe_arg(args: tuple, kwargs: dict) -> Optional[pd.DataFrame]:
+    """Return the first DataFrame in args or kwargs, if any."""
+    # Exact DataFrames are the common case, the type check skips the MRO
+    # walk of isinstance and subclasses still fall through to it
+    for arg in args:
+        if type(arg) is _DataFrame or isinstance(arg, _DataFrame):
+            return arg
+
+    for arg in kwargs.values():
+        if type(arg) is _DataFrame or isinstance(arg, _DataFrame):
+            return arg
+
+    return None
+
+
+def _dataframe_param(func: Callable) -> Optional[tuple]:
+    """Find the first parameter of func annotated as a DataFrame.
+
+    Returns its positional index (None for keyword-only parameters) and its
+    name, or None when no parameter has a DataFrame annotation.
+    """
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+
+    for index, param in enumerate(params):
+        if param.annotation is _DataFrame:
+            if param.kind is param.KEYWORD_ONLY:
+                return None, param.name
+            if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                return index, param.name
+    return None
+
+
+def track_dataframe_changes(
+    func: Optional[Callable] = None,
+    *,
+    pure: bool = False,
+    tablefmt: Optional[str] = None,
+    background: bool = False,
+) -> Callable:
+    """Decorator to track changes to DataFrames.
+
+    Can be used as ``@track_dataframe_changes`` or
+    ``@track_dataframe_changes(pure=True)``. Set ``pure`` for functions that
+    return a new DataFrame and never modify their input, the input is then
+    compared as is instead of being copied before the call.
+
+    Changed values are printed with DataFrame.to_string, pass a ``tablefmt``
+    such as ``"grid"`` to render them with tabulate instead.
+
+    With ``background`` the changes are still computed during the call, but
+    printing them is left to a worker thread so the wrapped function returns
+    right away. Call ``flush_reports()`` to wait for pending reports. The
+    returned DataFrame is printed as it is at that point, so later in-place
+    changes to it may show up in the report. Combined with ``pure`` the same
+    goes for the input DataFrame, since no snapshot of it is taken.
+    """
+    if func is None:
+        return lambda f: track_dataframe_changes(
+            f, pure=pure, tablefmt=tablefmt, background=background
+        )
+
+    # The parameter holding the DataFrame is looked up once here, so calls
+    # can fetch it directly instead of scanning every argument
+    df_param = _dataframe_param(func)
 
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -64,16 +506,19 @@ def track_dataframe_changes(func: Callable) -> Callable:
         # The way wrappers work is that these args are inherited from the function
         # that is being wrapped.
         df_before = None
-        for arg in args:
-            if isinstance(arg, pd.DataFrame):
-                df_before = arg.copy()
-                break
+        if df_param is not None:
+            index, name = df_param
+            if index is not None and index < len(args):
+                df_before = args[index]
+            else:
+                df_before = kwargs.get(name)
+            if not isinstance(df_before, _DataFrame):
+                df_before = None
 
         if df_before is None:
-            for arg in kwargs.values():
-                if isinstance(arg, pd.DataFrame):
-                    df_before = arg.copy()
-                    break
+            df_before = _find_dataframe_arg(args, kwargs)
+        if df_before is not None and not pure:
+            df_before = _snapshot(df_before)
 
         # Here is the wrapped function actually being executed
         result = func(*args, **kwargs)
@@ -82,50 +527,10 @@ def track_dataframe_changes(func: Callable) -> Callable:
         if isinstance(result, pd.DataFrame) and df_before is not None:
             changes = DataFrameChangeTracker.compare_df(df_before, result)
 
-            print(f"\nFunction: {func.__name__}")
-
-            #
-            if changes["rows"]["difference"] != 0:
-                print(
-                    f"Rows: {changes['rows']['before']} → {changes['rows']['after']} ({changes['rows']['difference']:+d})"
-                )
+            if background:
+                _queue_report(func.__name__, df_before, result, changes, tablefmt)
             else:
-                print("No row changes detected")
-
-            if changes["content_changes"]:
-                print(f"Content changes in columns: {changes['content_changes']}")
-            # Inside track_dataframe_changes decorator
-            for col in changes["content_changes"]:
-                # Get the common indices
-                common_indices = df_before.index.intersection(result.index)
-
-                # Compare only the common rows
-                changed_mask = (
-                    df_before.loc[common_indices, col]
-                    != result.loc[common_indices, col]
-                )
-
-                if changed_mask.any():
-                    print(f"\nChanges in {col}:")
-                    comparison = pd.DataFrame(
-                        {
-                            "Before": df_before.loc[changed_mask, col],
-                            "After": result.loc[changed_mask, col],
-                        }
-                    )
-                    # Add index labels for context
-                    context_cols = ["name"] if "name" in df_before.columns else []
-                    if context_cols:
-                        for context_col in context_cols:
-                            comparison[context_col] = df_before.loc[
-                                changed_mask, context_col
-                            ]
-
-                    print(
-                        tabulate(
-                            comparison, headers="keys", tablefmt="grid", showindex=False
-                        )
-                    )
+                _print_changes(func.__name__, df_before, result, changes, tablefmt)
 
         return result
 
@@ -1 +1 @@
-from DF_checker.df_checker.DataFrameChangeTracker import DataFrameChangeTracker
+from .DataFrameChangeTracker import DataFrameChangeTracker
@@ -0,0 +1,322 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from df_checker.DataFrameChangeTracker import (
+    DataFrameChangeTracker,
+    _queue_report,
+    flush_reports,
+    track_dataframe_changes,
+)
+
+# The package re-exports the class under the module's name, so the module
+# itself is looked up explicitly
+tracker_module = importlib.import_module("df_checker.DataFrameChangeTracker")
+
+
+def printed_changes(capsys, df: pd.DataFrame, new_values, col: str = "a") -> list:
+    """Run a decorated function that replaces col and return the printed rows."""
+
+    @track_dataframe_changes
+    def replace_column(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(**{col: new_values})
+
+    replace_column(df)
+    out = capsys.readouterr().out
+    if f"Changes in {col}:" not in out:
+        return []
+    table = out.split(f"Changes in {col}:\n")[1].strip().splitlines()
+    return [line.split() for line in table[1:]]
+
+
+def test_string_column_with_na(capsys):
+    df = pd.DataFrame({"a": pd.array(["x", pd.NA, "y"], dtype="string")})
+    new_values = pd.array(["z", "w", "y"], dtype="string")
+
+    assert printed_changes(capsys, df, new_values) == [["x", "z"], ["<NA>", "w"]]
+
+
+def test_boolean_column_with_na(capsys):
+    df = pd.DataFrame({"a": pd.array([True, pd.NA, False], dtype="boolean")})
+    new_values = pd.array([False, True, False], dtype="boolean")
+
+    assert printed_changes(capsys, df, new_values) == [
+        ["True", "False"],
+        ["<NA>", "True"],
+    ]
+
+
+def test_int_to_string_column(capsys):
+    df = pd.DataFrame({"a": [1, 2]})
+    new_values = pd.array(["1", pd.NA], dtype="string")
+
+    assert printed_changes(capsys, df, new_values) == [["1", "1"], ["2", "<NA>"]]
+
+
+def test_nullable_int_column_keeps_ints(capsys):
+    df = pd.DataFrame({"a": pd.array([1, 2, 3], dtype="Int64")})
+    new_values = pd.array([7, pd.NA, 3], dtype="Int64")
+
+    assert printed_changes(capsys, df, new_values) == [["1", "7"], ["2", "<NA>"]]
+
+
+def test_datetime_column_with_changed_dtype(capsys):
+    df = pd.DataFrame({"a": pd.to_datetime(["2020-01-01", "2020-01-02"])})
+
+    assert printed_changes(capsys, df, ["x", "y"]) == [
+        ["2020-01-01", "x"],
+        ["2020-01-02", "y"],
+    ]
+
+
+def test_nan_on_both_sides_is_unchanged(capsys):
+    df = pd.DataFrame({"a": [1.0, np.nan, 3.0]})
+
+    assert printed_changes(capsys, df, [2.0, np.nan, 3.0]) == [["1.0", "2.0"]]
+
+
+def test_na_on_both_sides_is_unchanged(capsys):
+    df = pd.DataFrame({"a": pd.array([1, pd.NA, 3], dtype="Int64")})
+    new_values = pd.array([7, pd.NA, 3], dtype="Int64")
+
+    assert printed_changes(capsys, df, new_values) == [["1", "7"]]
+
+
+def test_missing_values_on_both_sides_with_changed_dtype(capsys):
+    df = pd.DataFrame({"a": [1.0, np.nan, 3.0]})
+    new_values = pd.array(["1", pd.NA, "3"], dtype="string")
+
+    assert printed_changes(capsys, df, new_values) == [
+        ["1.0", "1"],
+        ["3.0", "3"],
+    ]
+
+
+def test_duplicate_index_labels(capsys):
+    df = pd.DataFrame({"a": [1, 2, 3]}, index=[0, 0, 1])
+
+    assert printed_changes(capsys, df, [1, 5, 3]) == [["2", "5"]]
+
+
+def test_duplicate_index_labels_added_by_function(capsys):
+    @track_dataframe_changes
+    def repeat_first_row(df: pd.DataFrame) -> pd.DataFrame:
+        result = pd.concat([df.iloc[:1], df])
+        result["a"] = [1, 9, 2]
+        return result
+
+    repeat_first_row(pd.DataFrame({"a": [1, 2]}))
+    out = capsys.readouterr().out
+
+    # The first occurrence of label 0 is compared against the original row
+    assert "Changes in a:" not in out
+
+
+def test_compare_df_float_columns_in_separate_buffers():
+    df_before = pd.DataFrame({"a": [1.0, np.nan], "b": [1.0, np.nan]})
+    df_after = df_before.copy()
+    df_after.loc[0, "b"] = 2.0
+
+    changes = DataFrameChangeTracker.compare_df(df_before, df_after)
+
+    assert changes["content_changes"] == ["b"]
+
+
+def test_compare_df_schema_change_to_category():
+    df_before = pd.DataFrame({"a": ["x", "y"], "b": [1, 2]})
+    df_after = df_before.astype({"a": "category", "b": "float64"})
+
+    changes = DataFrameChangeTracker.compare_df(df_before, df_after)
+
+    assert changes["schema_changes"] == {
+        "a": {"before": "object", "after": "category"},
+        "b": {"before": "int64", "after": "float64"},
+    }
+
+
+def test_compare_df_shallow_copy_has_no_changes():
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    changes = DataFrameChangeTracker.compare_df(df, df.copy(deep=False))
+
+    assert changes["columns"]["modified"] == []
+    assert changes["content_changes"] == []
+
+
+def test_compare_df_shared_blocks_with_new_labels():
+    df = pd.DataFrame({"a": [1, 2]})
+    relabelled = df.copy(deep=False)
+    relabelled.index = ["x", "y"]
+
+    changes = DataFrameChangeTracker.compare_df(df, relabelled)
+
+    assert changes["content_changes"] == ["a"]
+
+
+def test_flush_reports_prints_background_reports(capsys):
+    @track_dataframe_changes(background=True)
+    def double(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(a=df["a"] * 2)
+
+    for _ in range(3):
+        double(pd.DataFrame({"a": [1, 2]}))
+    flush_reports()
+
+    assert capsys.readouterr().out.count("Function: double") == 3
+
+
+def test_background_worker_survives_a_failing_report(capsys):
+    # A report whose changes are None fails while it is printed
+    _queue_report("broken", pd.DataFrame(), pd.DataFrame(), None, None)
+
+    @track_dataframe_changes(background=True)
+    def drop_a(df: pd.DataFrame) -> pd.DataFrame:
+        return df.drop("a", axis=1)
+
+    drop_a(pd.DataFrame({"a": [1], "b": [2]}))
+    flush_reports()
+
+    captured = capsys.readouterr()
+    assert "TypeError" in captured.err
+    assert "Function: drop_a" in captured.out
+
+
+def test_in_place_changes_are_tracked_by_default(capsys):
+    @track_dataframe_changes
+    def increment(df: pd.DataFrame) -> pd.DataFrame:
+        df["a"] += 1
+        return df
+
+    increment(pd.DataFrame({"a": [1, 2]}))
+
+    assert "Content changes in columns: ['a']" in capsys.readouterr().out
+
+
+def test_pure_compares_against_the_input_without_a_snapshot(capsys, monkeypatch):
+    def no_snapshot(df):
+        raise AssertionError("pure functions must not snapshot their input")
+
+    monkeypatch.setattr(tracker_module, "_snapshot", no_snapshot)
+
+    @track_dataframe_changes(pure=True)
+    def increment(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(a=df["a"] + 1)
+
+    increment(pd.DataFrame({"a": [1, 2]}))
+
+    assert "Content changes in columns: ['a']" in capsys.readouterr().out
+
+
+def test_tablefmt_renders_with_tabulate(capsys):
+    @track_dataframe_changes(tablefmt="grid")
+    def increment(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(a=df["a"] + 1)
+
+    increment(pd.DataFrame({"a": [1]}))
+    out = capsys.readouterr().out
+
+    assert "|   Before |   After |" in out
+    assert "|        1 |       2 |" in out
+
+
+def test_long_diffs_keep_first_and_last_rows(capsys):
+    df = pd.DataFrame({"a": range(25)})
+
+    rows = printed_changes(capsys, df, range(100, 125))
+
+    assert len(rows) == 21
+    assert rows[0] == ["0", "100"]
+    assert rows[9] == ["9", "109"]
+    assert rows[10] == ["...", "5", "more", "...", "..."]
+    assert rows[11] == ["15", "115"]
+    assert rows[-1] == ["24", "124"]
+
+
+def test_short_diffs_are_not_cut():
+    comparison = pd.DataFrame({"Before": range(20), "After": range(20)})
+
+    rendered = tracker_module._format_comparison(comparison, None)
+
+    assert "more" not in rendered
+    assert len(rendered.splitlines()) == 21
+
+
+def test_dataframe_param_keyword_only():
+    def func(scale, *, df: pd.DataFrame):
+        pass
+
+    assert tracker_module._dataframe_param(func) == (None, "df")
+
+
+def test_dataframe_param_without_annotation():
+    def func(df):
+        pass
+
+    assert tracker_module._dataframe_param(func) is None
+
+
+def test_dataframe_param_method_counts_self(capsys):
+    class Cleaner:
+        @track_dataframe_changes
+        def drop_a(self, df: pd.DataFrame) -> pd.DataFrame:
+            return df.drop("a", axis=1)
+
+    assert tracker_module._dataframe_param(Cleaner.drop_a.__wrapped__) == (1, "df")
+
+    Cleaner().drop_a(pd.DataFrame({"a": [1], "b": [2]}))
+
+    assert "Function: drop_a" in capsys.readouterr().out
+
+
+def test_dataframe_param_passed_by_keyword(capsys):
+    @track_dataframe_changes
+    def scale(factor, df: pd.DataFrame) -> pd.DataFrame:
+        return df * factor
+
+    scale(factor=2, df=pd.DataFrame({"a": [1, 2]}))
+
+    assert "Content changes in columns: ['a']" in capsys.readouterr().out
+
+
+def test_dataframe_param_falls_back_when_value_is_not_a_dataframe(capsys):
+    @track_dataframe_changes
+    def scale(df: pd.DataFrame = None, other=None) -> pd.DataFrame:
+        return other * 2
+
+    scale(None, other=pd.DataFrame({"a": [1, 2]}))
+
+    assert "Content changes in columns: ['a']" in capsys.readouterr().out
+
+
+def test_homogeneous_float_frame_masks_nan_on_both_sides():
+    df_before = pd.DataFrame(
+        np.array([[1.0, np.nan], [np.nan, 2.0]]), columns=["a", "b"]
+    )
+    df_after = pd.DataFrame(
+        np.array([[1.0, np.nan], [np.nan, 3.0]]), columns=["a", "b"]
+    )
+
+    changed = tracker_module._homogeneous_column_changes(df_before, df_after)
+
+    assert changed.tolist() == [False, True]
+    assert DataFrameChangeTracker.compare_df(df_before, df_after)[
+        "content_changes"
+    ] == ["b"]
+
+
+def test_compare_df_arrow_columns():
+    pytest.importorskip("pyarrow")
+    df_before = pd.DataFrame(
+        {
+            "a": pd.array([1, None, 3], dtype="int64[pyarrow]"),
+            "b": pd.array(["x", None, "y"], dtype="string[pyarrow]"),
+        }
+    )
+    df_after = df_before.copy()
+    df_after["a"] = pd.array([1, None, 4], dtype="int64[pyarrow]")
+
+    changes = DataFrameChangeTracker.compare_df(df_before, df_after)
+
+    assert changes["content_changes"] == ["a"]